@@ -7,6 +7,7 @@ from ..abstract import AbstractConfig
 
 class AbstractSearch:
 	'''Abstract class for search objects used by the config object to find the format data'''
+	__slots__ = () # searches are created for every query, so subclasses may avoid a per-instance dict
 	def __init__(self, origin: AbstractConfig, queries: Optional[Sequence[str]], default: Optional[Any], **kwargs):
 		super().__init__(**kwargs)
 
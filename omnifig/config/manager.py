@@ -1,21 +1,91 @@
-from typing import List, Dict, Optional, Union, Any, Sequence, Iterator, NamedTuple
+from typing import List, Dict, Optional, Union, Any, Sequence, Iterator, NamedTuple, IO
 import os
+import re
+import sys
 from pathlib import Path
-import io
 import yaml
-from collections import OrderedDict
-from omnibelt import Path_Registry, JSONABLE, unspecified_argument, export, load_export, linearize, CycleDetectedError
+from copy import deepcopy
+from collections import OrderedDict, Counter
+from omnibelt import Path_Registry, JSONABLE, unspecified_argument, export, load_export, CycleDetectedError, primitive
 
 from ..abstract import AbstractConfig, AbstractProject, AbstractConfigManager
 from .nodes import ConfigNode
 
 
+def _construct_ordered_mapping(loader, node):
+	loader.flatten_mapping(node)
+	# keys repeat across all config files (e.g. "_type" or common parameter names), so interning them means they are
+	# shared (also by all cached copies) and dict lookups with literal keys match by identity
+	try:
+		return OrderedDict((sys.intern(key) if type(key) is str else key, value)
+		                   for key, value in loader.construct_pairs(node))
+	except TypeError as exc: # same error as the default constructor
+		raise yaml.constructor.ConstructorError('while constructing a mapping', node.start_mark,
+		                                        f'found unhashable key ({exc})', node.start_mark)
+
+class _OrderedYamlLoader(yaml.SafeLoader):
+	'''Safe yaml loader which preserves the order of mappings.'''
+	pass
+_OrderedYamlLoader.add_constructor(yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, _construct_ordered_mapping)
+
+if hasattr(yaml, 'CSafeLoader'):
+	class _FastOrderedYamlLoader(yaml.CSafeLoader):
+		'''Same as :class:`_OrderedYamlLoader`, except using libyaml for parsing.'''
+		pass
+	_FastOrderedYamlLoader.add_constructor(yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG,
+	                                       _construct_ordered_mapping)
+else:
+	_FastOrderedYamlLoader = None
+
+
+_primitive_types = frozenset(primitive)
+def _copy_raw(data: JSONABLE) -> JSONABLE:
+	'''Copies parsed config data, where only the containers are copied (primitives are immutable so they are shared).'''
+	kind = type(data)
+	if kind in _primitive_types:
+		return data
+	if kind is OrderedDict or kind is dict:
+		return kind((key, _copy_raw(value)) for key, value in data.items())
+	if kind is list:
+		return [_copy_raw(value) for value in data]
+	return deepcopy(data) # anything unusual (e.g. dates or sets)
+
+
+def _load_ordered_yaml(stream: Union[str, bytes, IO]) -> JSONABLE:
+	'''
+	Parses yaml (preserving order), using libyaml if available since that is much faster.
+
+	Args:
+		stream: yaml data or an open (seekable) file, in which case any error messages include the file name
+
+	Returns:
+		The parsed data
+
+	'''
+	if _FastOrderedYamlLoader is not None:
+		try:
+			return yaml.load(stream, Loader=_FastOrderedYamlLoader)
+		except yaml.YAMLError:
+			# libyaml is stricter about some edge cases, so fall back to the pure python parser
+			if hasattr(stream, 'seek'):
+				stream.seek(0)
+	return yaml.load(stream, Loader=_OrderedYamlLoader)
+
+
 
 class ConfigManager(AbstractConfigManager):
 	_config_path_delimiter = '/'
 	_config_exts = ('yaml', 'yml', 'json', 'tml', 'toml')
-	_config_nones = {'None', 'none', '_none', '_None', 'null', 'nil', }
+	_config_nones = frozenset({'None', 'none', '_none', '_None', 'null', 'nil', })
 	_config_parent_key = '_base'
+	_raw_config_cache_size = 2000 # max number of parsed config files that are kept in memory
+	_raw_arg_cache_size = 1000 # max number of command-line values parsed with yaml that are kept in memory
+	# command-line values that yaml would parse as a plain string anyway (no special characters and
+	# a first character that can't start an implicitly resolved scalar such as a number, bool, or null)
+	_plain_arg_pattern = re.compile(r'[A-Za-z_][A-Za-z0-9_\-./]*')
+	_implicit_arg_starts = frozenset(yaml.SafeLoader.yaml_implicit_resolvers)
+	# plain decimal integers (no leading zeros, which yaml would read as octal)
+	_int_arg_pattern = re.compile(r'[-+]?(?:0|[1-9][0-9]*)')
 
 	ConfigNode = ConfigNode
 
@@ -28,6 +98,8 @@ class ConfigManager(AbstractConfigManager):
 	def __init__(self, project: AbstractProject):
 		self.registry = self.Config_Registry()
 		self.project = project
+		self._raw_config_cache = OrderedDict()
+		self._raw_arg_cache = OrderedDict()
 
 
 	def export(self, config: ConfigNode, name: Union[str, Path], *, root: Optional[Path] = None,
@@ -127,10 +199,25 @@ class ConfigManager(AbstractConfigManager):
 		return entries
 
 	def _parse_raw_arg(self, arg: str) -> JSONABLE:
-		val = yaml.safe_load(io.StringIO(arg))
-		if isinstance(val, str) and val in self._config_nones:
-			return None
-		return val
+		if arg[:1] not in self._implicit_arg_starts and self._plain_arg_pattern.fullmatch(arg):
+			# most arguments are plain strings (e.g. names), so skip the yaml parser
+			return None if arg in self._config_nones else arg
+		if self._int_arg_pattern.fullmatch(arg):
+			return int(arg)
+		# the same values tend to be parsed repeatedly (e.g. when parsing the arguments of many runs)
+		cache = self._raw_arg_cache
+		if arg in cache:
+			cache.move_to_end(arg)
+			val = cache[arg]
+		else:
+			# (not using libyaml, since it parses some edge cases, such as bare tags, differently)
+			val = yaml.safe_load(arg)
+			if isinstance(val, str) and val in self._config_nones:
+				val = None
+			cache[arg] = val
+			if len(cache) > self._raw_arg_cache_size:
+				cache.popitem(last=False)
+		return deepcopy(val) # the value may be a list or dict, which must not be shared
 
 
 	class UnknownBehaviorError(ValueError):
@@ -167,35 +254,29 @@ class ConfigManager(AbstractConfigManager):
 		configs = []
 		data = {}
 
-		remaining = list(reversed(argv))
-		if len(remaining):
+		num = len(argv)
+		if num:
 			# parse script (if provided)
-			term = remaining.pop()
-			if term.startswith('-') and not term.startswith('--'):
+			idx = 0
+			term = argv[idx]
+			is_key = term.startswith('--')
+			if term.startswith('-') and not is_key:
 				raise self.UnknownBehaviorError(term)
-			elif term.startswith('--'):
-				remaining.append(term)
-			elif script_name is not unspecified_argument:
-				remaining.append(term)
-			elif term != '_' and script_name is unspecified_argument:
-				script_name = term
-			if script_name not in {None, unspecified_argument}:
+			elif not is_key and script_name is unspecified_argument:
+				idx += 1
+				if term != '_':
+					script_name = term
+			if script_name is not None and script_name is not unspecified_argument:
 				meta['script_name'] = script_name
 
-			# parse remaining (keyword) arguments
-			while len(remaining):
-				term = remaining.pop()
-
-				if term.startswith('--'):
-					remaining.append(term)
-					break
-				else:
-					configs.append(term)
+			# parse configs (until the first keyword argument)
+			while idx < num and not argv[idx].startswith('--'):
+				configs.append(argv[idx])
+				idx += 1
 
+			# parse remaining (keyword) arguments
 			waiting_arg_key = None
-			while len(remaining):
-				term = remaining.pop()
-
+			for term in argv[idx:]:
 				if term.startswith('--'):
 					if waiting_arg_key is not None:
 						data[waiting_arg_key] = True
@@ -220,9 +301,9 @@ class ConfigManager(AbstractConfigManager):
 
 		# configurize parsed data (including meta)
 		config = self.create_config(configs, data)
-		meta = self.create_config(None, meta)
 		meta_base = config.push_peek('_meta', {}, silent=True, overwrite=False)
-		meta_base.update(meta)
+		if len(meta): # only create (and merge) the meta config if there is something in it
+			meta_base.update(self.create_config(None, meta))
 		return config
 
 
@@ -283,10 +364,8 @@ class ConfigManager(AbstractConfigManager):
 			ConfigNotFoundError: if the config is not registered
 
 		'''
-		if isinstance(name, Path) and name.is_file():
-			return name
-		elif os.path.isfile(name):
-			return Path(name)
+		if os.path.isfile(name): # single stat call for both paths and path strings
+			return name if isinstance(name, Path) else Path(name)
 		try:
 			return self.find_project_config_entry(name).path
 		except self.ConfigNotRegistered:
@@ -322,6 +401,125 @@ class ConfigManager(AbstractConfigManager):
 		return src
 
 
+	@staticmethod
+	def _linearize_chain(graph: Dict[Any, List[Any]]) -> Optional[List[Any]]:
+		'''
+		Linearizes the config ancestry starting from ``None`` (the root) if it is a single chain.
+
+		Args:
+			graph: mapping of each node to its parents
+
+		Returns:
+			The linearization (same as the C3 linearization in this case) or None if any node has multiple parents
+			or there is a cycle.
+
+		'''
+		if any(len(parents) > 1 for parents in graph.values()):
+			return None
+		order = [None]
+		seen = {None}
+		parents = graph[None]
+		while len(parents):
+			node = parents[0]
+			if node in seen:
+				return None # cycle
+			seen.add(node)
+			order.append(node)
+			parents = graph[node]
+		return order
+
+
+	@staticmethod
+	def _c3_merge(sequences: List[List[Any]]) -> List[Any]:
+		'''
+		Merges the linearizations of the bases of a node (the merge step of the C3 linearization).
+
+		Args:
+			sequences: linearizations of all the bases followed by the list of bases itself
+
+		Returns:
+			The merged linearization (not including the node itself)
+
+		Raises:
+			TypeError: if there is no consistent linearization (same as for the MRO of classes)
+
+		'''
+		sequences = [seq for seq in sequences if len(seq)]
+		# rather than slicing and scanning all the tails for every candidate, keep track of the current position
+		# in each sequence and how often each item still appears in any tail
+		positions = [0] * len(sequences)
+		tails = Counter(item for seq in sequences for item in seq[1:])
+		merged = []
+		while True:
+			for seq, pos in zip(sequences, positions):
+				if pos < len(seq) and tails[seq[pos]] == 0:
+					head = seq[pos]
+					break
+			else:
+				rest = [seq[pos:] for seq, pos in zip(sequences, positions) if pos < len(seq)]
+				if len(rest):
+					raise TypeError(f'Cannot create a consistent linearization of the bases: {rest}')
+				return merged
+			merged.append(head)
+			for i, seq in enumerate(sequences):
+				pos = positions[i]
+				if pos < len(seq) and seq[pos] == head:
+					pos += 1
+					positions[i] = pos
+					if pos < len(seq):
+						tails[seq[pos]] -= 1
+
+
+	@classmethod
+	def _linearize(cls, graph: Dict[Any, List[Any]]) -> List[Any]:
+		'''
+		C3 linearization (the same as the MRO of classes) of the config ancestry starting from ``None`` (the root).
+
+		The nodes are ordered with a depth-first traversal from the root, so every node is linearized after all of
+		its parents (post-order) and the linearizations of the parents are always available for the merge step.
+
+		Args:
+			graph: mapping of each node to its parents
+
+		Returns:
+			The linearization of ``None``
+
+		Raises:
+			CycleDetectedError: if there is a cycle (``remaining`` contains the nodes on the cycle)
+			TypeError: if a node has duplicate parents or there is no consistent linearization
+
+		'''
+		for parents in graph.values():
+			if len(set(parents)) != len(parents):
+				raise TypeError(f'Duplicate bases: {parents}')
+
+		order = []
+		finished = {None: False} # False while the node is on the current path, True once all its parents are done
+		stack = [(None, iter(graph[None]))]
+		while len(stack):
+			node, parents = stack[-1]
+			for parent in parents:
+				done = finished.get(parent)
+				if done is None:
+					finished[parent] = False
+					stack.append((parent, iter(graph[parent])))
+					break
+				if not done: # the parent is still on the current path
+					path = [step for step, _ in stack]
+					raise CycleDetectedError({step: set(graph[step]) for step in path[path.index(parent):]})
+			else:
+				stack.pop()
+				finished[node] = True
+				order.append(node)
+
+		linearizations = {}
+		for node in order:
+			parents = graph[node]
+			linearizations[node] = [node, *cls._c3_merge([*[linearizations[parent] for parent in parents],
+			                                                 list(parents)])]
+		return linearizations[None]
+
+
 	def _merge_raw_configs(self, raws: List[JSONABLE]) -> AbstractConfig:
 		'''
 		Merges a list of raw configs into a single config object.
@@ -333,15 +531,15 @@ class ConfigManager(AbstractConfigManager):
 			The merged config
 
 		'''
-		singles = [self.configurize(raw) for raw in raws]
-
-		if not len(singles):
+		if not len(raws):
 			return self.ConfigNode.from_raw({})
 
-		merged = singles.pop()
-		while len(singles):
-			update = singles.pop()
-			merged.update(update)
+		# fold from the lowest priority (last) to the highest priority (first) config
+		itr = reversed(raws)
+		merged = self.configurize(next(itr))
+		for raw in itr:
+			# freshly configurized nodes have no products, so there's nothing to clear (which would traverse both trees)
+			merged.update(self.configurize(raw), clear_product=False)
 
 		return merged
 
@@ -350,19 +548,44 @@ class ConfigManager(AbstractConfigManager):
 		'''
 		Loads raw data of a config file (formats: JSON, YAML, TOML).
 
+		Since the same files (especially bases) tend to be loaded many times, the parsed data is cached
+		until the file is modified (i.e. its modification time or size changes), keeping only the most
+		recently used files (see :meth:`clear_raw_config_cache`).
+
 		Args:
 			path: to the config file
 
 		Returns:
-			The raw data of the config file
+			The raw data of the config file (a fresh copy that may be modified freely)
 
 		Raises:
 			ValueError: if the config file is not a valid format
 
 		'''
+		path = Path(path).resolve() # the same relative path may refer to different files (e.g. after a chdir)
+		stat = path.stat()
+		version = stat.st_mtime_ns, stat.st_size # the size catches rewrites within the resolution of the mtime
+		cache = self._raw_config_cache
+		cached = cache.get(path)
+		if cached is None or cached[0] != version:
+			cached = version, self._read_raw_config(path)
+			cache[path] = cached
+		cache.move_to_end(path)
+		while len(cache) > self._raw_config_cache_size:
+			cache.popitem(last=False)
+		return _copy_raw(cached[1])
+
+
+	def clear_raw_config_cache(self) -> None:
+		'''Removes all cached config file contents, so that all config files are read again when loaded.'''
+		self._raw_config_cache.clear()
+
+
+	def _read_raw_config(self, path: Path) -> JSONABLE:
+		'''Reads and parses the config file (without any caching), see :meth:`load_raw_config`.'''
 		if path.suffix.endswith('.yml') or path.suffix.endswith('.yaml'):
-			# return load_yaml(path, ordered=True)
-			return load_export(path=path, fmt='yaml', ordered=True)
+			with open(path, 'rb') as f: # the yaml parser detects and handles the encoding itself
+				return _load_ordered_yaml(f)
 		elif path.suffix == '.json':
 			# return load_json(path)
 			return load_export(path=path, fmt='json')
@@ -411,35 +634,42 @@ class ConfigManager(AbstractConfigManager):
 		raws = {None: data}
 		used_paths = {}
 
+		found_paths = {} # bases shared by multiple configs only need to be found once
 		todo = list(configs)
 		while len(todo):
 			name = todo.pop()
-			path = self.find_config_path(name)
+			path = found_paths.get(name)
+			if path is None:
+				path = self.find_config_path(name)
+				found_paths[name] = path
 			if path not in raws:
-				if not path.exists():
-					raise FileNotFoundError(path)
 				used_paths[name] = path
-				raws[path] = self.load_raw_config(path)
-				if raws[path] is None:
-					raws[path] = {}
+				raw = self.load_raw_config(path) # raises FileNotFoundError if the file no longer exists
+				if raw is None:
+					raw = {}
+				raws[path] = raw
 				ancestry_names[path] = name
-				parent_table[path] = self._find_config_parents(path, raws[path])
-				todo.extend(parent_table[path])
+				parents = self._find_config_parents(path, raw)
+				parent_table[path] = parents
+				todo.extend(parents)
 
 		if len(used_paths) != len(todo):
-			graph = {key: [used_paths[name] for name in srcs] for key, srcs in parent_table.items()}
-
-			try:
-				order = linearize(graph)[None]
-			except CycleDetectedError as c:
-				bad = c.remaining
-				del bad[None]
-				used_names = {path: name for name, path in used_paths.items()}
-				bad = [used_names[path] for path in bad]
-				raise self.ConfigCycleError(sorted(bad))
-
-			ancestry = [ancestry_names[p] for p in order[1:]]
-			order = [data] + [raws[p] for p in order[1:]]
+			# (every name was resolved exactly once, even if several names refer to the same file)
+			graph = {key: [found_paths[name] for name in srcs] for key, srcs in parent_table.items()}
+
+			# with at most one base per config (by far the most common case), the linearization is just the chain
+			order = self._linearize_chain(graph)
+			if order is None:
+				try:
+					order = self._linearize(graph)
+				except CycleDetectedError as c:
+					used_names = {path: name for name, path in used_paths.items()}
+					bad = [used_names[path] for path in c.remaining]
+					raise self.ConfigCycleError(sorted(bad))
+
+			bases = order[1:]
+			ancestry = [ancestry_names[p] for p in bases]
+			order = [data, *[raws[p] for p in bases]]
 		else:
 			order = [data]
 			ancestry = []
@@ -485,10 +715,8 @@ class ConfigManager(AbstractConfigManager):
 
 		'''
 		merged = self.create_config()
-		
-		todo = list(configs)
-		while len(todo):
-			self.update_config(merged, todo.pop())
+		for config in reversed(configs):
+			self.update_config(merged, config)
 		return merged
 
 
@@ -1,6 +1,9 @@
-from typing import List, Dict, Tuple, Optional, Union, Any, Sequence, Type, Iterator, NamedTuple, ContextManager
+from typing import List, Dict, Tuple, Optional, Union, Any, Sequence, Type, Iterator, NamedTuple, ContextManager, \
+	Callable
 from pathlib import Path
 from contextlib import nullcontext
+from functools import lru_cache
+from itertools import count
 from copy import deepcopy
 import yaml
 from collections import OrderedDict
@@ -14,6 +17,55 @@ from ..abstract import AbstractConfig, AbstractProject, AbstractCreator, Abstrac
 from .abstract import AbstractSearch, AbstractReporter
 
 
+_primitive_types = frozenset(primitive) # exact types only (subclasses take the usual path in `from_raw`)
+
+# libyaml's emitter is much faster (the output loads identically, although long lines may be wrapped differently)
+_FastYamlDumper = getattr(yaml, 'CDumper', yaml.Dumper)
+
+
+
+@lru_cache(maxsize=8192)
+def _split_address(addr: str, delimiter: str) -> Tuple[str, ...]:
+	'''
+	Splits the address into its keys (cached, since the same addresses tend to be accessed repeatedly).
+
+	Args:
+		addr: address to split (e.g. ``model.encoder.layers.0``)
+		delimiter: separates the keys in the address
+
+	Returns:
+		Tuple of keys (the tuple is shared between calls, so it must not be modified)
+
+	'''
+	return tuple(addr.split(delimiter))
+
+
+
+@lru_cache(maxsize=1024)
+def _compile_address(addr: str, delimiter: str) -> Callable[['ConfigNode'], 'ConfigNode']:
+	'''
+	Splits the address once and returns a function that walks directly to the corresponding node.
+
+	Args:
+		addr: address to compile (e.g. ``model.encoder.layers.0``)
+		delimiter: separates the keys in the address
+
+	Returns:
+		Function which, given a node, returns the node at ``addr`` relative to it
+
+	'''
+	*connectors, last = _split_address(addr, delimiter)
+
+	def getter(node: 'ConfigNode') -> 'ConfigNode':
+		for key in connectors:
+			node = node._get(key) if len(key) else node.parent
+			if node is None:
+				raise ConfigNode._MissingKey(addr)
+		return node._get(last)
+
+	return getter
+
+
 
 class ConfigNode(AutoTreeNode, AbstractConfig):
 	'''
@@ -28,7 +80,7 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 	             parent_key: Optional[str] = None, **kwargs) -> 'ConfigNode':
 		'''
 		Converts the given raw data into a config node.
-		This will recursively convert all nested data into config nodes.
+		This will convert all nested data into config nodes.
 
 		Args:
 			raw: python data to convert (may be a primitive or a dict/list-like object)
@@ -40,26 +92,70 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 			The created config node
 
 		'''
+		node, items = cls._from_raw_single(raw, parent, parent_key, kwargs)
+		if items is None:
+			return node
+
+		# nested containers are built with an explicit stack (rather than recursively), where each container is
+		# only added to its parent once it is complete (so that merging duplicate keys includes all the contents)
+		stack = [(node, items)]
+		single, add = cls._from_raw_single, cls._add_raw_child # (looked up once, as they are used for every value)
+		while stack:
+			current, items = stack[-1]
+			for key, value in items:
+				child, child_items = single(value, current, key, kwargs)
+				if child_items is not None:
+					stack.append((child, child_items))
+					break
+				add(current, key, child, kwargs)
+			else:
+				stack.pop()
+				if stack:
+					add(stack[-1][0], current._parent_key, current, kwargs)
+		return node
+
+
+	@classmethod
+	def _from_raw_single(cls, raw: Any, parent: Optional['ConfigNode'], parent_key: Optional[str],
+	                     kwargs: Dict[str, Any]) -> Tuple['ConfigNode', Optional[Iterator[Tuple[str, Any]]]]:
+		'''
+		Creates the config node for the given raw data without converting any nested data (see :meth:`from_raw`).
+
+		Returns:
+			The new node and, if the node is a container, an iterator over the (key, raw value) of its children
+
+		'''
+		if type(raw) in _primitive_types: # by far the most common case, so skip the isinstance checks
+			return cls.DefaultNode(payload=raw, parent=parent, parent_key=parent_key, **kwargs), None
 		if isinstance(raw, ConfigNode):
 			raw.parent = parent
 			raw._parent_key = parent_key
-			return raw
+			return raw, None
 		if isinstance(raw, dict):
-			node = cls.SparseNode(parent=parent, parent_key=parent_key, **kwargs)
-			for key, value in raw.items():
-				child = cls.from_raw(value, parent=node, parent_key=key, **kwargs)
-				if key in node:
-					node.get(key).update(child)
-				else:
-					node.set(key, child, **kwargs)
-		elif isinstance(raw, (tuple, list)):
-			node = cls.DenseNode(parent=parent, parent_key=parent_key, **kwargs)
-			for idx, value in enumerate(raw):
-				idx = str(idx)
-				node.set(idx, cls.from_raw(value, parent=node, parent_key=idx, **kwargs), **kwargs)
+			return cls.SparseNode(parent=parent, parent_key=parent_key, **kwargs), iter(raw.items())
+		if isinstance(raw, (tuple, list)):
+			return cls.DenseNode(parent=parent, parent_key=parent_key, **kwargs), zip(map(str, count()), raw)
+		return cls.DefaultNode(payload=raw, parent=parent, parent_key=parent_key, **kwargs), None
+
+
+	@classmethod
+	def _add_raw_child(cls, node: 'ConfigNode', key: str, child: 'ConfigNode', kwargs: Dict[str, Any]) -> None:
+		'''Adds a newly converted child to the node (merging it into any existing child with the same key).'''
+		if isinstance(node, cls.DenseNode):
+			# elements are converted in order and already know their parent, so skip the address and index parsing
+			node._children.append(child)
+		elif type(key) is str and node._address_delimiter not in key:
+			# plain keys are by far the most common, and the child already knows its parent and key
+			try:
+				existing = node._get(key)
+			except node._MissingKey:
+				node._set(key, child)
+			else:
+				existing.update(child)
+		elif key in node:
+			node.get(key).update(child)
 		else:
-			node = cls.DefaultNode(payload=raw, parent=parent, parent_key=parent_key, **kwargs)
-		return node
+			node.set(key, child, **kwargs)
 	
 	
 	class Search(AbstractSearch):
@@ -73,6 +169,11 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 		delegation_prefix = '<>' # delegate from current node
 		delegation_origin_prefix = '<o>' # delegate from origin node of the query
 		missing_key_payload = '__x__' # payload for a node that should be treated as missing
+		# first characters of all special payloads above (any other payload can skip the prefix checks)
+		_special_payload_starts = frozenset({'<', '_'})
+
+		__slots__ = ('origin', 'queries', 'default', 'query_chain', 'query_node', 'result_node', 'unused_queries',
+		             'force_create', 'parent_search', 'extra_queries')
 
 		class _sub_search:
 			'''
@@ -81,6 +182,8 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 			'''
 			past = None
 
+			__slots__ = ('_old', 'current') # one is created for every nested search
+
 			def __init__(self, current: AbstractSearch):
 				self._old = self.past
 				self.current = current
@@ -117,6 +220,7 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 			self.queries = queries
 			self.default = default
 			self.query_chain = []
+			self.unused_queries = ()
 			self.result_node = None
 			self.force_create = False
 			self.parent_search = parent_search
@@ -124,7 +228,8 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 
 
 		def _resolve_query(self, src: 'ConfigNode', query: str, *remaining: str,
-		                   chain: Optional[List[str]] = None) -> Tuple[Optional['ConfigNode'], Tuple, List[str]]:
+		                   chain: Optional[List[str]] = None, settings: Optional['ConfigNode.Settings'] = None) \
+				-> Tuple[Optional['ConfigNode'], Tuple, List[str]]:
 			'''
 			Traverses the config tree from the given source node to find the node corresponding to the given query,
 			thereby appending the query to the query chain.
@@ -142,6 +247,8 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 				query: the target key to search for
 				*remaining: alternative queries to search for (if the current query fails)
 				chain: chain of queries that have been traversed so far (e.g. due to delegations or missing keys)
+				settings: of the config tree (looked up from ``src`` if not provided, and passed on to the
+					searches in the parents, so that they aren't looked up from the root at every level)
 
 			Returns:
 				A tuple of the node when resolving all given queries in order (or None if no node was found),
@@ -150,35 +257,45 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 			'''
 			if chain is None:
 				chain = []
-			if query is None:
-				return src, remaining, chain
-
-			try:
-				result = src.get(query)
-			except src._MissingKey:
-				result = None
-
-			if result is None:
-				if src.settings.get('ask_parents', True) and not query.startswith(self.confidential_prefix):
-					parent = src.parent
+			# try the alternative queries in order (in a loop, rather than recursing with the rest of the queries)
+			queries = (query, *remaining)
+			last = len(queries) - 1
+			for idx, query in enumerate(queries):
+				if query is None:
+					return src, queries[idx+1:], chain
+
+				try:
+					# most queries are single keys, which don't need the address to be evaluated
+					result = src._get(query) if type(query) is str and src._address_delimiter not in query \
+						else src.get(query)
+				except src._MissingKey:
+					result = None
+
+				if result is None:
+					# check the cheap conditions first, the settings are only looked up (from the root) when needed
+					parent = None if query.startswith(self.confidential_prefix) else src.parent
 					if parent is not None:
-						result, _, parent_chain = self._resolve_query(parent, query)
-						if result is None:
-							grandparent = parent.parent
-							if grandparent is not None and src.settings.get('allow_cousins', False) \
-									and src._parent_key is not None:
-								cousin_query = f'{src._parent_key}.{query}'
-								result, _, cousin_chain = self._resolve_query(grandparent, cousin_query)
-								if result is not None:
-									chain.append(f'..{cousin_chain[-1]}')
-									return result, remaining, chain
-						else:
-							chain.append(f'.{parent_chain[-1]}')
-							return result, remaining, chain
-				if len(remaining):
-					return self._resolve_query(src, *remaining, chain=chain)
-			chain.append(query)
-			return result, remaining, chain
+						if settings is None:
+							settings = src.settings
+						if settings.get('ask_parents', True):
+							result, _, parent_chain = self._resolve_query(parent, query, settings=settings)
+							if result is None:
+								grandparent = parent.parent
+								if grandparent is not None and src._parent_key is not None \
+										and settings.get('allow_cousins', False):
+									cousin_query = f'{src._parent_key}.{query}'
+									result, _, cousin_chain = self._resolve_query(grandparent, cousin_query,
+									                                              settings=settings)
+									if result is not None:
+										chain.append(f'..{cousin_chain[-1]}')
+										return result, queries[idx+1:], chain
+							else:
+								chain.append(f'.{parent_chain[-1]}')
+								return result, queries[idx+1:], chain
+					if idx < last:
+						continue
+				chain.append(query)
+				return result, queries[idx+1:], chain
 
 
 		def _find_node(self) -> 'ConfigNode':
@@ -221,16 +338,17 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 				SearchFailed: if the node could not be found and no default was provided
 
 			'''
+			origin = self.origin
 			if silent is None:
-				silent = self.origin.silent
+				silent = origin.silent
 			try:
 				result = self._find_node()
 			except self.SearchFailed:
-				if self.default is self.origin._empty_default:
+				if self.default is origin._empty_default:
 					raise
 				return self.default
 			result._trace = self
-			self.origin.reporter.report_node(result, silent=silent)
+			origin.reporter.report_node(result, silent=silent)
 			return result
 
 
@@ -255,25 +373,26 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 				SearchFailed: if the node could not be found and no default was provided
 
 			'''
+			origin = self.origin
 			if silent is None:
-				silent = self.origin.silent
+				silent = origin.silent
 			try:
 				node = self._find_node()
 			except self.SearchFailed:
-				if self.default is self.origin._empty_default:
+				if self.default is origin._empty_default:
 					raise
-				old = self.origin._trace
-				self.origin._trace = self
-				self.origin.reporter.report_default(self.origin, self.default, silent=silent)
-				self.origin._trace = old
+				old = origin._trace
+				origin._trace = self
+				origin.reporter.report_default(origin, self.default, silent=silent)
+				origin._trace = old
 				result = self.default
 			else:
-				if node is self.origin.empty_value:
+				if node is origin.empty_value:
 					result = node # TODO: finish
-					old = self.origin._trace
-					self.origin._trace = self
-					self.origin.reporter.report_empty(self.origin, silent=silent)
-					self.origin._trace = old
+					old = origin._trace
+					origin._trace = self
+					origin.reporter.report_empty(origin, silent=silent)
+					origin._trace = old
 				else:
 					old = node._trace
 					node._trace = self
@@ -313,36 +432,49 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 
 			Raises:
 				SearchFailed: if the node is not valid or a delegation could not be resolved
-
-			'''
-			if node is None:
-				raise self.SearchFailed(*self.query_chain)
-			if self.origin.empty_value is node:
-				return node
-			if node.has_payload:
-				payload = node.payload
-				if isinstance(payload, str):
-					if payload.startswith(self.delegation_prefix):
-						ref = payload[len(self.delegation_prefix):]
-						result, self.unused_queries, self.query_chain \
-							= self._resolve_query(node, ref, *self.unused_queries, chain=self.query_chain)
-						return self.process_node(result)
-					elif payload.startswith(self.delegation_origin_prefix):
-						ref = payload[len(self.delegation_origin_prefix):]
-						result, self.unused_queries, self.query_chain \
-							= self._resolve_query(self.origin, ref, *self.unused_queries, chain=self.query_chain)
-						return self.process_node(result)
-					elif payload.startswith(self.force_create_prefix):
-						ref = payload[len(self.force_create_prefix):]
-						result, self.unused_queries, self.query_chain \
-							= self._resolve_query(node, ref, *self.unused_queries, chain=self.query_chain)
-						self.force_create = True
-						return self.process_node(result)
-					elif payload == self.missing_key_payload:
-						result, self.unused_queries, self.query_chain \
-							= self._resolve_query(self.query_node, *self.unused_queries, chain=self.query_chain)
-						return self.process_node(result)
-			return node
+				CycleError: if the delegations form a cycle
+
+			'''
+			empty = self.origin.empty_value
+			visited = None # states (node and remaining queries) that were already processed (only needed for delegations)
+			# follow chains of delegations in a loop (each step replaces the node with the result of the delegation)
+			while True:
+				if node is None:
+					raise self.SearchFailed(*self.query_chain)
+				if empty is node:
+					return node
+				payload = node._payload # (once, rather than through the `has_payload` and `payload` properties)
+				if payload is unspecified_argument or not isinstance(payload, str) or payload[:1] not in self._special_payload_starts:
+					return node
+				# the result of processing a node only depends on the node and the remaining alternative queries,
+				# so reaching the same state again means the delegations would loop forever
+				state = id(node), self.unused_queries
+				if visited is None:
+					visited = {state}
+				elif state in visited:
+					raise node.CycleError(node)
+				else:
+					visited.add(state)
+				if payload.startswith(self.delegation_prefix):
+					ref = payload[len(self.delegation_prefix):]
+					node, self.unused_queries, self.query_chain \
+						= self._resolve_query(node, ref, *self.unused_queries, chain=self.query_chain)
+				elif payload.startswith(self.delegation_origin_prefix):
+					ref = payload[len(self.delegation_origin_prefix):]
+					node, self.unused_queries, self.query_chain \
+						= self._resolve_query(self.origin, ref, *self.unused_queries, chain=self.query_chain)
+				elif payload.startswith(self.force_create_prefix):
+					ref = payload[len(self.force_create_prefix):]
+					node, self.unused_queries, self.query_chain \
+						= self._resolve_query(node, ref, *self.unused_queries, chain=self.query_chain)
+					self.force_create = True
+				elif payload == self.missing_key_payload:
+					if not self.unused_queries: # no alternatives left to try
+						raise self.SearchFailed(*self.query_chain)
+					node, self.unused_queries, self.query_chain \
+						= self._resolve_query(self.query_node, *self.unused_queries, chain=self.query_chain)
+				else:
+					return node
 
 	SearchFailed = Search.SearchFailed
 
@@ -370,6 +502,25 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 			self.max_num_aliases = max_num_aliases
 
 
+		@property
+		def indent(self) -> str:
+			'''Prepended to every line once for each depth of the node in the config tree.'''
+			return self._indent
+		@indent.setter
+		def indent(self, indent: str):
+			self._indent = indent
+			self._indents = {}
+
+
+		def _get_indent(self, depth: int) -> str:
+			'''Returns the full indent for the given depth (cached, since the same few depths are used repeatedly).'''
+			indent = self._indents.get(depth)
+			if indent is None:
+				indent = depth * self._indent
+				self._indents[depth] = indent
+			return indent
+
+
 		@classmethod
 		def _node_depth(cls, node: 'ConfigNode', _fuel: int = 1000) -> int:
 			'''
@@ -385,11 +536,14 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 			Raises:
 				RecursionError: if the node is too deep in the tree
 			'''
-			if _fuel <= 0:
-				raise RecursionError('Depth exceeded 1000 (there is probably an infinite loop in the config tree)')
-			if node.parent is None:
-				return 0
-			return cls._node_depth(node.parent, _fuel=_fuel - 1) + 1
+			depth = 0
+			parent = node.parent
+			while parent is not None:
+				if depth >= _fuel:
+					raise RecursionError('Depth exceeded 1000 (there is probably an infinite loop in the config tree)')
+				depth += 1
+				parent = parent.parent
+			return depth
 
 
 		@staticmethod
@@ -428,15 +582,14 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 				return '.'
 			queries = trace.query_chain
 
-			if trace.parent_search is not None:
-			# if len(search.parent_search):
-				queries = queries.copy()
-				queries[0] = f'({queries[0]})'  # if getattr(search.parent_search[0]
-
 			if len(queries) > self.max_num_aliases:
 				key = self.alias_fmt.join([queries[0], '...', queries[-1]])
 			else:
 				key = self.alias_fmt.join(queries)
+
+			if trace.parent_search is not None: # wrap the first query (without copying the whole chain)
+				first = queries[0]
+				key = f'({first}){key[len(first):]}'
 			return key.replace('_', '-')
 
 
@@ -455,7 +608,7 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 			trace = node.trace
 			if trace is not None:
 				node = trace.origin
-			indent = self._node_depth(node) * self.indent
+			indent = self._get_indent(self._node_depth(node))
 			return f'{self.flair}{indent}{line}'
 
 
@@ -504,7 +657,7 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 
 			Args:
 				node: result of the search
-				silent: if True, the message is not printed (but still returned)
+				silent: if True, nothing is reported (the message is not even formatted)
 
 			Returns:
 				None
@@ -520,12 +673,14 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 			Args:
 				node: result of the search
 				default: value that was used instead
-				silent: if True, the message is not printed (but still returned)
+				silent: if True, nothing is reported (the message is not even formatted)
 
 			Returns:
-				Message that was printed
+				Message that was printed (or None if silent)
 
 			'''
+			if silent:
+				return
 			trace = node.trace
 			key = self.get_key(trace)
 
@@ -539,12 +694,14 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 
 			Args:
 				node: result of the search
-				silent: if True, the message is not printed (but still returned)
+				silent: if True, nothing is reported (the message is not even formatted)
 
 			Returns:
-				Message that was printed
+				Message that was printed (or None if silent)
 
 			'''
+			if silent:
+				return
 			trace = node.trace
 			key = self.get_key(trace)
 
@@ -560,12 +717,14 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 			Args:
 				node: result of the search
 				product: if True, the iterator returns the products of the nodes (defaults to False)
-				silent: if True, the message is not printed (but still returned)
+				silent: if True, nothing is reported (the message is not even formatted)
 
 			Returns:
-				Message that was printed
+				Message that was printed (or None if silent)
 
 			'''
+			if silent:
+				return
 			trace = node.trace
 			key = self.get_key(trace)
 			N = len(node)
@@ -580,12 +739,14 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 			Args:
 				node: result of the search
 				product: the product that was reused
-				silent: if True, the message is not printed (but still returned)
+				silent: if True, nothing is reported (the message is not even formatted)
 
 			Returns:
-				Message that was printed
+				Message that was printed (or None if silent)
 
 			'''
+			if silent:
+				return
 			trace = node.trace
 			key = self.get_key(trace)
 
@@ -593,9 +754,6 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 			line = f'{key}{self.colon}{self._format_value(product)}{reusing}'
 			return self.log(self._stylize(node, line), silent=silent)
 
-			line = f'REUSING {self._format_component(key, component_type, modifiers, creator_type)}'
-			return self.log(self._stylize(node, line), silent=silent)
-
 
 		def create_primitive(self, node: 'ConfigNode', value: Primitive = unspecified_argument, *,
 		                     silent: bool = None) -> Optional[str]:
@@ -605,12 +763,14 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 			Args:
 				node: result of the search
 				value: of the product
-				silent: if True, the message is not printed (but still returned)
+				silent: if True, nothing is reported (the message is not even formatted)
 
 			Returns:
-				Message that was printed
+				Message that was printed (or None if silent)
 
 			'''
+			if silent:
+				return
 			trace = node.trace
 			key = self.get_key(trace)
 
@@ -626,12 +786,14 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 
 			Args:
 				node: result of the search
-				silent: if True, the message is not printed (but still returned)
+				silent: if True, nothing is reported (the message is not even formatted)
 
 			Returns:
-				Message that was printed
+				Message that was printed (or None if silent)
 
 			'''
+			if silent:
+				return
 			trace = node.trace
 			if trace is not None:
 				key = self.get_key(trace)
@@ -654,12 +816,14 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 				component_type: registered name of the component
 				modifiers: registered names of the modifiers
 				creator_type: registered name of the creator (defaults to None)
-				silent: if True, the message is not printed (but still returned)
+				silent: if True, nothing is reported (the message is not even formatted)
 
 			Returns:
-				Message that was printed
+				Message that was printed (or None if silent)
 
 			'''
+			if silent:
+				return
 			trace = node.trace
 			key = self.get_key(trace)
 			line = f'CREATING {self._format_component(key, component_type, modifiers, creator_type)}'
@@ -717,6 +881,28 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 			                       component_entry=component_entry, silent=silent, **kwargs)
 
 
+		@staticmethod
+		def _pull_setting(config: 'ConfigNode', key: str, default: Any = None) -> Any:
+			'''
+			Silently pulls a creator setting (such as the component type) from the config node.
+
+			Settings are usually confidential keys (that don't default to parents) and are missing for most nodes
+			(e.g. all primitives and containers), in which case the full search can be skipped.
+
+			Args:
+				config: node for which the product is being created
+				key: of the setting
+				default: returned if the setting is not specified
+
+			Returns:
+				The (processed) value of the setting or the default
+
+			'''
+			if key.startswith(config.Search.confidential_prefix) and not config.has(key):
+				return default
+			return config.pull(key, default, silent=True)
+
+
 		def __init__(self, config: 'ConfigNode', *, component_type: Optional[str] = unspecified_argument,
 		             modifiers: Optional[Sequence[str]] = None, project: Optional[AbstractProject] = None,
 		             component_entry: Optional[NamedTuple] = unspecified_argument, silent: Optional[bool] = None,
@@ -734,10 +920,10 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 				**kwargs: additional arguments (unused)
 			'''
 			if component_type is unspecified_argument:
-				component_type = config.pull(self._config_component_key, None, silent=True) \
+				component_type = self._pull_setting(config, self._config_component_key) \
 					if isinstance(config, config.SparseNode) else None
 			if component_type is not None and modifiers is None:
-				modifiers = config.pull(self._config_modifier_key, None, silent=True)
+				modifiers = self._pull_setting(config, self._config_modifier_key)
 				if modifiers is None:
 					modifiers = []
 				elif isinstance(modifiers, dict):
@@ -783,7 +969,7 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 				return
 			if self.component_entry is unspecified_argument:
 				self.component_entry = self.project.find_artifact('component', self.component_type)
-			creator = config.pull(self._config_creator_key, self.component_entry.creator, silent=True)
+			creator = self._pull_setting(config, self._config_creator_key, self.component_entry.creator)
 			if creator is not None:
 				entry = self.project.find_artifact('creator', creator)
 				if type(self) != entry.cls:
@@ -855,10 +1041,15 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 			else:
 				settings = config.settings
 				old_silent = settings.get('silent', None)
-				settings['silent'] = silent
-				obj = cls(config, *args, **kwargs)
-				if old_silent is not None:
-					settings['silent'] = old_silent
+				if old_silent == silent: # nothing to change (and restore) in the shared settings
+					obj = cls(config, *args, **kwargs)
+				else:
+					settings['silent'] = silent
+					try:
+						obj = cls(config, *args, **kwargs)
+					finally:
+						if old_silent is not None:
+							settings['silent'] = old_silent
 
 			if isinstance(obj, AbstractCertifiable):
 				obj = obj.__certify__(config)
@@ -894,16 +1085,14 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 
 			context = nullcontext() if trace is None else trace.sub_search()
 
+			pull = config.pull
 			with context:
+				# same children as when iterating over the node (e.g. skipping removed children),
+				# all collected in one pass within the same search context
 				if isinstance(config, config.SparseNode):
-					product = {}
-					for key, child in config.named_children():
-						product[key] = config.pull(key, silent=silent)
-
+					product = {key: pull(key, silent=silent) for key in config._child_keys()}
 				elif isinstance(config, config.DenseNode):
-					product = []
-					for key, child in config.named_children():
-						product.append(config.pull(key, silent=silent))
+					product = [pull(key, silent=silent) for key in config._child_keys()]
 				else:
 					raise NotImplementedError(f'Unknown container type: {type(config)}')
 
@@ -941,13 +1130,15 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 				None
 
 			'''
+			# nodes are tracked by identity, since hashing (and comparing) nodes requires their full addresses
+			key = id(config)
 			table = ConfigNode.DefaultCreator._creation_context
 			if table is None:
-				ConfigNode.DefaultCreator._creation_context = {config: True}
+				ConfigNode.DefaultCreator._creation_context = {key: True}
 			else:
-				if config in table:
+				if key in table:
 					raise config.CycleError(config)
-				table[config] = False
+				table[key] = False
 
 
 		def _end_context(self, config: 'ConfigNode', product: Any) -> None:
@@ -962,11 +1153,12 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 				None
 
 			'''
-			reset = ConfigNode.DefaultCreator._creation_context.get(config, None)
+			key = id(config)
+			reset = ConfigNode.DefaultCreator._creation_context.get(key, None)
 			if reset:
 				ConfigNode.DefaultCreator._creation_context = None
 			elif reset is not None:
-				del ConfigNode.DefaultCreator._creation_context[config]
+				del ConfigNode.DefaultCreator._creation_context[key]
 
 
 		def create_product(self, config: 'ConfigNode', args: Optional[Tuple] = None,
@@ -997,15 +1189,17 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 
 			self._setup_context(config)
 
-			if self.component_type is None:
-				if config.has_payload:
-					value = self._create_primitive(config, silent=silent)
+			value = None
+			try:
+				if self.component_type is None:
+					if config.has_payload:
+						value = self._create_primitive(config, silent=silent)
+					else:
+						value = self._create_container(config, silent=silent)
 				else:
-					value = self._create_container(config, silent=silent)
-			else:
-				value = self._create_component(config, args=args, kwargs=kwargs, silent=silent)
-
-			self._end_context(config, value)
+					value = self._create_component(config, args=args, kwargs=kwargs, silent=silent)
+			finally: # even if the creation fails, so no stale nodes are left behind in the context
+				self._end_context(config, value)
 			return value
 			
 
@@ -1028,6 +1222,50 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 		return self.Search(origin=self, queries=queries, default=default, **kwargs)
 
 
+	def peek(self, query: Optional[str] = None, default: Optional[Any] = AbstractConfig._empty_default, *,
+	         silent: Optional[bool] = None) -> 'ConfigNode':
+		'''
+		Searches in the config based on the given query and returns the resulting node.
+
+		Same as :meth:`peeks` with a single query (but passing the query straight to the search).
+
+		Args:
+			query: to be resolved (if None, the search starts and ends at ``self``)
+			default: value to be returned if the query fails
+			silent: if True, suppresses the reporter from printing messages
+
+		Returns:
+			Config node that corresponds to the query
+
+		Raises:
+			Search.SearchFailed: if the query fails and no default value is given
+
+		'''
+		return self.search(query, default=default).find_node(silent=silent)
+
+
+	def pull(self, query: Optional[str] = None, default: Optional[Any] = AbstractConfig._empty_default, *,
+	         silent: Optional[bool] = None) -> Any:
+		'''
+		Searches in the config based on the given query and returns the product of the resulting node.
+
+		Same as :meth:`pulls` with a single query (but passing the query straight to the search).
+
+		Args:
+			query: to be resolved (if None, the search starts and ends at ``self``)
+			default: value to be returned if the query fails
+			silent: if True, suppresses the reporter from printing messages
+
+		Returns:
+			Product of the config node corresponding to the query
+
+		Raises:
+			Search.SearchFailed: if the query fails and no default value is given
+
+		'''
+		return self.search(query, default=default).find_product(silent=silent)
+
+
 	def peeks(self, *queries: str, default: Optional[Any] = AbstractConfig._empty_default,
 	          silent: Optional[bool] = None) -> 'ConfigNode':
 		'''
@@ -1052,6 +1290,27 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 		return self.search(*queries, default=default).find_node(silent=silent)
 
 
+	def compile_address(self, addr: str) -> Callable[['ConfigNode'], 'ConfigNode']:
+		'''
+		Compiles the given address into a function that retrieves the corresponding node from any config node.
+
+		This is meant for addresses that are accessed repeatedly (e.g. in a training loop), since the address
+		is only split once (and the compiled function is cached). Note that the compiled function does not
+		search the config, so there is no defaulting to parent nodes, no delegations, and nothing is reported.
+
+		Args:
+			addr: address of the node relative to the node the compiled function is called with
+
+		Returns:
+			Function which, given a config node, returns the node at ``addr``
+
+		Raises:
+			KeyError: (when calling the compiled function) if the node doesn't exist
+
+		'''
+		return _compile_address(addr, self._address_delimiter)
+
+
 	def pulls(self, *queries: str, default: Optional[Any] = AbstractConfig._empty_default,
 	          silent: Optional[bool] = None, **kwargs) -> Any:
 		'''
@@ -1098,11 +1357,11 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 		if self.settings.get('readonly', False):
 			raise self.ReadOnlyError('Cannot push to read-only node')
 
-		if value == self._delete_value:
+		if isinstance(value, str) and value == self._delete_value: # (values may be arbitrary objects)
 			self.remove(addr)
 			return True
 
-		if not self.has(addr) or overwrite:
+		if overwrite or not self.has(addr): # only check for an existing node if it matters
 			self.set(addr, value)
 			return True
 		return False
@@ -1113,10 +1372,34 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 		return len(list(self._child_keys()))
 
 
+	def named_children(self, skip_empty: bool = True) -> Iterator[Tuple[str, 'ConfigNode']]:
+		'''
+		Returns an iterator over the child nodes of ``self`` including their keys (without any searching).
+
+		Args:
+			skip_empty: if True, children without a payload or any (non-empty) children are skipped
+
+		Returns:
+			Iterator producing tuples in the form of (key, child_node)
+
+		'''
+		for key, child in self._iterate_children():
+			# check the payload first, as `is_leaf` has to walk through the children of the child
+			if skip_empty and child._payload is unspecified_argument and child.is_leaf:
+				continue
+			yield key, child
+
+
 	def _child_keys(self) -> Iterator[str]:
 		'''Returns the keys of the children of the node.'''
-		for key, child in self.named_children():
-			if child is not self.empty_value and not child.has_payload or child.payload not in {'__x__', '_x_'}:
+		# same as filtering `named_children()`, but also skipping removed children
+		removed = self._removed_payloads
+		for key, child in self._iterate_children():
+			payload = child._payload # (rather than the `has_payload` property)
+			if payload is not unspecified_argument:
+				if payload not in removed:
+					yield key
+			elif not child.is_leaf:
 				yield key
 
 
@@ -1151,9 +1434,9 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 
 		'''
 		self.reporter.report_iterator(self, product=False, silent=silent)
+		search = self.search
 		for key in self._child_keys():
-			child = self.search(key).find_node(silent=silent)
-			yield key, child
+			yield key, search(key).find_node(silent=silent)
 
 
 	def pull_children(self, *, force_create: Optional[bool] = False, silent: Optional[bool] = None) -> Iterator[Any]:
@@ -1170,8 +1453,8 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 			Iterator over the products of the children of the node
 
 		'''
-		for key, product in self.pull_named_children(force_create=force_create, silent=silent):
-			yield product
+		for _, child in self.peek_named_children(silent=silent):
+			yield child.create() if force_create else child.process()
 
 
 	def pull_named_children(self, *, force_create: Optional[bool] = False, silent: Optional[bool] = None) \
@@ -1342,10 +1625,12 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 		self._manager = manager
 		self._reporter = reporter
 		self._settings = settings
-		if self.reporter is None:
-			self.reporter = self.Reporter()
-		if self.settings is None:
-			self.settings = self.Settings()
+		parent = self._parent
+		if parent is None or parent is unspecified_argument: # otherwise the root (already initialized) is used
+			if reporter is None:
+				self._reporter = self.Reporter()
+			if settings is None:
+				self._settings = self.Settings()
 	
 	
 	def __deepcopy__(self, memodict={}):
@@ -1361,6 +1646,35 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 		return new
 	
 	
+	@property
+	def root(self) -> 'ConfigNode':
+		'''Top-level node of the config tree that contains this node.'''
+		node = self
+		while True: # loop up the tree (rather than recursing through every ancestor)
+			parent = node._parent
+			if parent is None or parent is unspecified_argument:
+				return node
+			node = parent
+
+
+	def my_address(self) -> Tuple[Union[str, int], ...]:
+		'''
+		Returns the keys from the root of the config tree to this node.
+
+		Returns:
+			Address of this node relative to the root
+
+		'''
+		keys = []
+		node = self
+		while True:
+			parent = node._parent
+			if parent is None or parent is unspecified_argument:
+				return tuple(reversed(keys))
+			keys.append(node._parent_key)
+			node = parent
+
+
 	def __eq__(self, other):
 		'''Compares this config node to another object.'''
 		return type(self) == type(other) \
@@ -1391,14 +1705,83 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 		return self.manager.export(self, name, root=root, fmt=fmt)
 
 
+	def _evaluate_address(self, addr: str, auto_create: bool = False) -> Tuple['ConfigNode', str]:
+		'''
+		Finds the node that contains the last key of the given address (see :class:`omnibelt.AddressNode`).
+
+		Args:
+			addr: address relative to this node
+			auto_create: if True, missing intermediate nodes are created
+
+		Returns:
+			Tuple of the node that contains the last key and that last key
+
+		'''
+		addr = str(addr)
+		if self._address_delimiter not in addr: # most addresses are just keys, so there's nothing to split
+			return self, addr
+		# walk down the address in a single loop (rather than recursing and rejoining the rest at every level)
+		*connectors, last = _split_address(addr, self._address_delimiter)
+		node = self
+		for i, key in enumerate(connectors):
+			try:
+				child = node._get(key) if len(key) else node.parent
+			except KeyError:
+				child = None
+			if not isinstance(child, ConfigNode):
+				if not auto_create:
+					raise node._ConnectorError(node, key, [*connectors[i+1:], last])
+				node._auto_create_child(key)
+				child = node._get(key)
+			node = child
+		return node, last
+
+
+	def has(self, addr: str) -> bool:
+		'''
+		Checks whether the node at the given address exists (without defaulting to parents or delegations).
+
+		Args:
+			addr: address relative to this node
+
+		Returns:
+			True if the node exists
+
+		'''
+		if type(addr) is str and self._address_delimiter not in addr: # plain keys don't need to be evaluated
+			return self._has(addr)
+		return super().has(addr)
+
+
+	def _find_inherited(self, attr: str) -> Any:
+		'''
+		Walks up the config tree (starting from ``self``) and returns the first value of ``attr`` that isn't None.
+
+		Attributes such as the settings, reporter, project, and manager are usually only set in the root node,
+		so this replaces a recursive lookup through the properties of every ancestor with a single loop.
+
+		Args:
+			attr: name of the (private) attribute to look up
+
+		Returns:
+			The value of ``attr`` of the closest node where it is set, or None if it is not set anywhere
+
+		'''
+		node = self
+		while True:
+			value = getattr(node, attr)
+			if value is not None:
+				return value
+			# read the parent attribute directly (rather than through the `parent` and `has_parent` properties)
+			node = node._parent
+			if node is None or node is unspecified_argument:
+				return None
+
+
 	@property
 	def project(self):
 		'''Returns the project associated with this config tree.'''
-		if self._project is None:
-			parent = self.parent
-			if parent is not None:
-				return parent.project
-		return self._project
+		return self._find_inherited('_project')
 	@project.setter
 	def project(self, project: AbstractProject):
 		parent = self.parent
@@ -1414,11 +1797,8 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 		Returns the list of all config files that were composed to produce this config tree.
 		Analogous to the method resolution order (``mro``) for classes.
 		'''
-		if self._cro is None:
-			if self.parent is None:
-				return ()
-			return self.parent.cro
-		return self._cro
+		cro = self._find_inherited('_cro')
+		return () if cro is None else cro
 
 
 	@property
@@ -1427,21 +1807,14 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 		Returns the list of config files that were explicitly mentioned to produce this config tree.
 		Analogous to ``__bases__`` for classes.
 		'''
-		if self._bases is None:
-			if self.parent is None:
-				return ()
-			return self.parent.bases
-		return self._bases
+		bases = self._find_inherited('_bases')
+		return () if bases is None else bases
 
 
 	@property
 	def manager(self):
 		'''Returns the manager associated with this config tree.'''
-		if self._manager is None:
-			parent = self.parent
-			if parent is not None:
-				return parent.manager
-		return self._manager
+		return self._find_inherited('_manager')
 	@manager.setter
 	def manager(self, manager: AbstractConfigManager):
 		parent = self.parent
@@ -1463,11 +1836,7 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 	@property
 	def reporter(self) -> Reporter:
 		'''Returns the reporter associated with this config tree.'''
-		if self._reporter is None:
-			parent = self.parent
-			if parent is not None:
-				return parent.reporter
-		return self._reporter
+		return self._find_inherited('_reporter')
 	@reporter.setter
 	def reporter(self, reporter: Reporter):
 		parent = self.parent
@@ -1480,11 +1849,7 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 	@property
 	def settings(self) -> Settings:
 		'''Returns the (global) settings associated with this config tree.'''
-		if self._settings is None:
-			parent = self.parent
-			if parent is not None:
-				return parent.settings
-		return self._settings
+		return self._find_inherited('_settings')
 	@settings.setter
 	def settings(self, settings: Settings):
 		parent = self.parent
@@ -1513,6 +1878,8 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 		'''
 		Context manager for temporarily modifying the (global) settings of a config tree.
 		'''
+		__slots__ = ('config', 'old_settings', 'settings')
+
 		def __init__(self, config: 'ConfigNode', settings: Dict[str, bool]):
 			self.config = config
 			self.old_settings = None
@@ -1520,13 +1887,17 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 
 		def __enter__(self):
 			settings = self.config.settings
-			self.old_settings = settings.copy()
+			# only the settings that are changed are backed up (and restored), rather than copying all of them
+			self.old_settings = {key: settings.get(key, unspecified_argument) for key in self.settings}
 			settings.update(self.settings)
 
 		def __exit__(self, exc_type, exc_val, exc_tb):
 			settings = self.config.settings
-			settings.clear()
-			settings.update(self.old_settings)
+			for key, value in self.old_settings.items():
+				if value is unspecified_argument:
+					settings.pop(key, None)
+				else:
+					settings[key] = value
 	def context(self, **settings: bool) -> ContextManager:
 		'''Returns a context manager for temporarily modifying the (global) settings of this config tree.'''
 		return self.ConfigContext(self, settings)
@@ -1552,8 +1923,9 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 		'''
 		if creator is unspecified_argument:
 			creator = self.settings.get('creator')
-		creator = self.DefaultCreator if creator is None else self.project.find_artifact('creator', creator).cls
-		out = creator(self, silent=silent, project=self.project,  **kwargs)\
+		project = self.project
+		creator = self.DefaultCreator if creator is None else project.find_artifact('creator', creator).cls
+		out = creator(self, silent=silent, project=project,  **kwargs)\
 			.create_product(self, args=component_args, kwargs=component_kwargs, silent=silent)
 		return out
 
@@ -1643,10 +2015,57 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 			recursive: if True, the products of all child nodes are also removed
 
 		'''
-		self._product = None
-		if recursive:
-			for _, child in self.named_children():
-				child.clear_product(recursive=recursive)
+		if not recursive:
+			self._product = None
+			return
+		# traverse with an explicit stack (rather than recursing) since configs can be large and deeply nested
+		todo = [self]
+		while len(todo):
+			node = todo.pop()
+			node._product = None
+			todo.extend(child for _, child in node.named_children())
+
+
+	def to_python(self) -> Union[Dict[str, Any], List[Any]]:
+		'''
+		Converts the contents of this node into python containers (dicts and lists) and primitives.
+
+		Leaf payloads are used directly, and the tree is traversed with an explicit stack (rather than recursing),
+		filling in each container as it is reached.
+
+		Returns:
+			A :class:`dict` (for sparse nodes) or :class:`list` (for dense nodes) of the contents
+
+		'''
+		empty = self.empty_value
+		root = self._python_structure()
+		todo = [(self, root)]
+		pop, push = todo.pop, todo.append # (bound once, as they are used for every node)
+		while todo:
+			node, out = pop()
+			if isinstance(out, list):
+				add = out.append
+				for child in node._children: # dense nodes keep their children in a list (no need for the keys)
+					if child is empty:
+						value = child
+					else:
+						value = child._payload # same as checking `has_payload`, but without the property call
+						if value is unspecified_argument:
+							value = child._python_structure()
+							push((child, value))
+					add(value)
+			else:
+				for key, child in node._iterate_children():
+					if child is empty:
+						value = child
+					else:
+						value = child._payload
+						if value is unspecified_argument:
+							value = child._python_structure()
+							push((child, value))
+					out[key] = value
+		return root
+
 
 	def to_yaml(self, stream=None, default_flow_style=None, sort_keys=True, **kwargs: Any) -> None:
 		'''
@@ -1662,6 +2081,7 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 			None
 
 		'''
+		kwargs.setdefault('Dumper', _FastYamlDumper)
 		return yaml.dump(self.to_python(), stream, default_flow_style=default_flow_style, sort_keys=sort_keys,
 		                 **kwargs)
 
@@ -1695,30 +2115,52 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 			self.payload = update.payload
 		elif self.has_payload:
 			self.payload = unspecified_argument
+		if not len(self._children):
+			# nothing to merge with (e.g. a freshly created node), so all children can be moved over directly
+			for key, child in update.named_children():
+				child._parent = self
+				child._parent_key = key
+				self._set(key, child)
+			return self
+		empty = self.empty_value
 		for key, child in update.named_children():
-			child.parent = self
-			if key in self:
-				self[key].update(child)
+			# keys of children are never addresses, so look up the existing child directly (only once)
+			try:
+				existing = self._get(key)
+			except self._MissingKey:
+				existing = empty
+			if existing is empty:
+				# the child is already a config node, so there's no need to convert it again (as `set` would)
+				# only adopted children are reparented (merged ones are discarded)
+				child._parent = self
+				child._parent_key = key
+				self._set(key, child)
 			else:
-				self[key] = child
+				existing.update(child, clear_product=False) # the whole subtrees were already cleared above
 		return self
 
 
 	_delete_value = '_x_'
+	_removed_payloads = frozenset({Search.missing_key_payload, _delete_value}) # children that are skipped
 	def validate(self):
 		'''
 		Recursively validates the contents of this config node.
 
 		Including removing any children with the value ``_x_`` (marked for removal).
 		'''
-		bad = []
-		for key, child in self.named_children():
-			if child.has_payload and child.payload == self._delete_value:
-				bad.append(key)
-			else:
-				child.validate()
-		for key in bad:
-			self.remove(key)
+		# traverse with an explicit stack (rather than recursing) since configs can be large and deeply nested
+		todo = [self]
+		while len(todo):
+			node = todo.pop()
+			bad = []
+			for key, child in node.named_children():
+				if child.has_payload and child.payload == node._delete_value:
+					bad.append(key)
+				else:
+					todo.append(child)
+			# keys of children are never addresses, and removing in reverse keeps the indices of dense nodes valid
+			for key in reversed(bad):
+				node._remove(key)
 
 	def silence(self, silent: bool = True) -> ContextManager:
 		'''Convenience method for temporarily setting the silent flag of this config node.'''
@@ -1734,26 +2176,27 @@ class ConfigNode(AutoTreeNode, AbstractConfig):
 class ConfigSparseNode(AutoTreeSparseNode, ConfigNode):
 	'''A config node that treats its children as being in a dict.'''
 	_python_structure = dict
+	to_python = ConfigNode.to_python # the (non-recursive) conversion of ConfigNode, rather than the one of SparseNode
 
 	def _get(self, addr: str):
-		try:
-			return super()._get(addr)
-		except self._MissingKey:
-			try:
-				return super()._get(addr.replace('-', '_'))
-			except self._MissingKey:
-				pass
-			raise
+		# misses are common (e.g. when defaulting to parents), so avoid raising more than once
+		children = self._children
+		node = children.get(addr, unspecified_argument)
+		if node is unspecified_argument and '-' in addr:
+			node = children.get(addr.replace('-', '_'), unspecified_argument)
+		if node is unspecified_argument:
+			raise self._MissingKey(addr)
+		return node
 
 	def _set(self, addr: str, node):
 		return super()._set(addr, node)
 
 	def _remove(self, addr: str):
-		if addr in self._children:
-			del self._children[addr]
+		self._children.pop(addr, None)
 
 	def _has(self, addr: str):
-		return addr in self._children or addr.replace('-', '_') in self._children
+		children = self._children
+		return addr in children or ('-' in addr and addr.replace('-', '_') in children)
 
 
 
@@ -1762,6 +2205,30 @@ class ConfigSparseNode(AutoTreeSparseNode, ConfigNode):
 class ConfigDenseNode(AutoTreeDenseNode, ConfigNode):
 	'''A config node that treats its children as being in a list.'''
 	_python_structure = list
+	to_python = ConfigNode.to_python # the (non-recursive) conversion of ConfigNode, rather than the one of DenseNode
+
+	def _iterate_children(self) -> Iterator[Tuple[str, ConfigNode]]:
+		# same as enumerating the children (with string keys), but without a python-level generator step per child
+		return zip(map(str, count()), self._children)
+
+	@staticmethod
+	def _is_named_key(addr: Union[str, int]) -> bool:
+		# keys such as names can never be indices (e.g. when a search defaults to the parent),
+		# so they are rejected without raising (and catching) an error in `int()`
+		return type(addr) is str and (not addr or addr[0] == '_' or addr[0].isalpha())
+
+	def _get(self, addr: Union[str, int]) -> ConfigNode:
+		if self._is_named_key(addr):
+			raise self._MissingKey(addr)
+		return super()._get(addr)
+
+	def _has(self, addr: Union[str, int]) -> bool:
+		if self._is_named_key(addr):
+			return False
+		try:
+			return super()._has(addr)
+		except ValueError: # any other key that isn't an index
+			return False
 
 
 
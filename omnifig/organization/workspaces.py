@@ -442,7 +442,7 @@ class GeneralProject(ProjectBase, name='general'):
 			The output of the script.
 
 		'''
-		if script_name not in {None, unspecified_argument}:
+		if script_name is not None and script_name is not unspecified_argument:
 			config.push('_meta.script_name', script_name, overwrite=True, silent=True) # TODO: handle readonly configs
 		return self.run(config, *args, **kwargs)
 
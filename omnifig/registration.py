@@ -82,7 +82,7 @@ class script(_Project_Registration_Decorator):
 	def register_project(project: AbstractProject, name: str, item: Callable[[AbstractConfig], Any],
 	                     description: Optional[str] = None, hidden: Optional[bool] = None, **kwargs) -> None:
 		if description is None and item.__doc__ is not None:
-			description = item.__doc__.split('\n')[0]
+			description = item.__doc__.split('\n', 1)[0]
 		if hidden is None:
 			hidden = name.startswith('_')
 		project.register_artifact('script', name, item, description=description, hidden=hidden, **kwargs)
@@ -150,7 +150,7 @@ class component(_Project_Registration_Decorator):
 	                     description: Optional[str] = None, creator: Optional[Union[str, AbstractCreator]] = None,
 	                     **kwargs) -> None:
 		if description is None and item.__doc__ is not None:
-			description = item.__doc__.split('\n')[0]
+			description = item.__doc__.split('\n', 1)[0]
 		project.register_artifact('component', name, item, description=description, creator=creator, **kwargs)
 
 
@@ -179,7 +179,7 @@ class modifier(_Project_Registration_Decorator):
 	def register_project(project: AbstractProject, name: str, item: Callable[[AbstractConfig], Any],
 	                     description: Optional[str] = None, **kwargs) -> None:
 		if description is None and item.__doc__ is not None:
-			description = item.__doc__.split('\n')[0]
+			description = item.__doc__.split('\n', 1)[0]
 		project.register_artifact('modifier', name, item, description=description, **kwargs)
 
 
@@ -1,4 +1,5 @@
 import sys, os, shutil
+import yaml
 from omnibelt import load_export
 
 import _test_util as tu
@@ -449,6 +450,72 @@ def test_export():
 		shutil.rmtree(root)
 	
 
+def test_raw_config_cache():
+	manager = fig.config.ConfigManager(None)
+
+	root = tu.TEST_PATH / 'temp-cache'
+	root.mkdir(exist_ok=True)
+	path = root / 'cached.yaml'
+	path.write_text('a: 1\nb: [2, 3]\n')
+
+	A = manager.load_raw_config(path)
+	assert A == {'a': 1, 'b': [2, 3]}
+	A['b'].append(4)
+	assert manager.load_raw_config(path) == {'a': 1, 'b': [2, 3]}
+
+	path.write_text('a: 10\n')
+	stat = path.stat()
+	os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+	assert manager.load_raw_config(path) == {'a': 10}
+
+	# same modification time, but different size
+	path.write_text('a: 100\n')
+	os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+	assert manager.load_raw_config(path) == {'a': 100}
+
+	manager.clear_raw_config_cache()
+	assert len(manager._raw_config_cache) == 0
+	assert manager.load_raw_config(path) == {'a': 100}
+
+	# relative paths are cached by the file they refer to
+	other = root / 'other'
+	other.mkdir(exist_ok=True)
+	(other / 'cached.yaml').write_text('a: 1000\n')
+	cwd = os.getcwd()
+	try:
+		os.chdir(root)
+		assert manager.load_raw_config('cached.yaml') == {'a': 100}
+		assert manager.load_raw_config(os.path.join('other', '..', 'cached.yaml')) == {'a': 100}
+		assert len(manager._raw_config_cache) == 1
+		os.chdir(other)
+		assert manager.load_raw_config('cached.yaml') == {'a': 1000}
+	finally:
+		os.chdir(cwd)
+
+	if root.exists():
+		shutil.rmtree(root)
+
+
+def test_parse_raw_arg():
+	manager = fig.config.ConfigManager(None)
+
+	for arg in ['{a: 1, b: [2]}', '[1, {c: d}]', 'a: 1', '!', '!!str 5', '!!float 1', '5', 'hello', 'null', 'None']:
+		expected = yaml.safe_load(arg)
+		if expected == 'None':
+			expected = None
+		for _ in range(2): # (second time from the cache)
+			val = manager._parse_raw_arg(arg)
+			assert val == expected and type(val) is type(expected), arg
+
+	for arg in ['|#', ' ? -', '{a: [1}']:
+		try:
+			manager._parse_raw_arg(arg)
+		except yaml.YAMLError:
+			pass
+		else:
+			assert False, f'YAMLError not raised for {arg!r}'
+
+
 def test_components():
 	A = fig.create_config('test5')
 	
@@ -594,6 +661,14 @@ def test_removing():
 	
 	assert len(node) == 1
 	assert tuple(next(itr)) == ('papagei', 'parrot')
+
+	B = fig.create_config(birds=['_x_', '_x_', 'papageno', '_x_', 'papagena'])
+	assert B.pull('birds', silent=True) == ['papageno', 'papagena']
+
+	C = fig.create_config(vogel={'papagei': 'parrot', 'papagena': '__x__'}, birds=['papageno', '__x__'])
+	assert C.pull('vogel', silent=True) == {'papagei': 'parrot'}
+	assert C.pull('birds', silent=True) == ['papageno']
+	assert C.pull('vogel.papagena', 'missing', silent=True) == 'missing'
 	
 
 def test_raw_and_cousins():
@@ -645,6 +720,35 @@ def test_pull_cycle():
 		assert e.config.my_address() == ('a',)
 	else:
 		assert False, 'CycleError not raised'
+	assert A.DefaultCreator._creation_context is None # cleaned up despite the error
+
+
+def test_delegation_cycle():
+
+	for raw, query in [({'a': '<>a'}, 'a'), ({'a': '<>b', 'b': '<>a'}, 'a'),
+	                   ({'a': {'b': '<>c'}, 'c': '<>a.b'}, 'a.b')]:
+		A = fig.create_config(**raw)
+		try:
+			A.pull(query, silent=True)
+		except A.CycleError:
+			pass
+		else:
+			assert False, f'CycleError not raised for {raw}'
+
+	# revisiting a node is fine as long as there are different alternatives left
+	A = fig.create_config(a='<>missing', c=5)
+	assert A.pulls('a', 'a', 'c', silent=True) == 5
+
+
+def test_search_leaf():
+
+	A = fig.create_config(a='_foo', b='<foo', c='<>d', d=1)
+
+	# searching without any queries returns the node itself (after following delegations)
+	assert A.peek('a').pulls(silent=True) == '_foo'
+	assert A.peek('a').peeks(silent=True).pull(silent=True) == '_foo'
+	assert A.peek('b').pulls(silent=True) == '<foo'
+	assert A.peek('c').pulls(silent=True) == 1
 
 
 def test_underscores():
@@ -688,8 +792,74 @@ def test_underscores2():
 	assert A.pull('-c.-y') == '-a_'
 
 
+def test_compile_address():
+
+	A = fig.create_config(model={'encoder': {'layers': [{'heads': 4}, {'heads': 8}]}, 'd_e': 1})
+
+	get_heads = A.compile_address('model.encoder.layers.1.heads')
+	assert get_heads(A).payload == 8
+	assert A.compile_address('model.encoder.layers.1.heads') is get_heads
+
+	layers = A.peek('model.encoder.layers')
+	assert A.compile_address('0.heads')(layers).payload == 4
+	assert A.compile_address('.1')(layers.peek('0')) is layers.peek('1')
+	assert A.compile_address('model.d-e')(A).payload == 1
+
+	try:
+		A.compile_address('model.decoder')(A)
+	except KeyError:
+		pass
+	else:
+		assert False, 'KeyError not raised'
+
+
+def test_list_keys():
+
+	A = fig.create_config(name='top', layers=[{'heads': 4}, 8])
 
+	layers = A.peek('layers')
+	assert layers.has('0') and layers.has('-1') and layers.has(1)
+	assert not layers.has('2')
+	assert not layers.has('name')
+	assert not layers.has('1.5')
+	assert layers.pull('name', silent=True) == 'top'
+	assert layers.pull('0.heads', silent=True) == 4
 
 
+def test_context():
+
+	A = fig.create_config(a={'b': 1}, c=2)
+	A.settings['allow_cousins'] = True
 
+	with A.silence():
+		assert A.silent
+		with A.context(silent=False, ask_parents=False):
+			assert not A.silent
+			assert A.peek('a').pull('c', 'missing') == 'missing'
+		assert A.silent
+		assert A.peek('a').pull('c') == 2
+	assert not A.silent
+	assert 'ask_parents' not in A.settings
+	assert A.settings['allow_cousins']
 
+
+def test_base_aliases():
+	root = tu.TEST_PATH / 'temp-bases'
+	root.mkdir(exist_ok=True)
+	(root / 'common.yaml').write_text('shared: 1\nx: common\n')
+	(root / 'first.yaml').write_text('_base: [temp-bases/common]\nx: first\n')
+	(root / 'second.yaml').write_text(f'_base: [{(root / "common.yaml").as_posix()}]\nx: second\n')
+	registry = fig.get_current_project().config_manager.registry
+	entries = fig.get_current_project().register_config_dir(root, prefix='temp-bases/')
+
+	try:
+		# the same base is referred to by name and by path
+		C = fig.create_config('temp-bases/first', 'temp-bases/second')
+		assert C.pull('x') == 'first'
+		assert C.pull('shared') == 1
+		assert len(C._cro) == 3
+	finally:
+		for entry in entries: # the configs are only registered for this test
+			del registry[entry.name]
+		if root.exists():
+			shutil.rmtree(root)